@@ -0,0 +1,92 @@
+import numpy as np
+from kNNIndex import squaredDistances, buildIndex
+
+class IVFIndex:
+    """
+    Approximate nearest neighbour search with an inverted file index. The training rows are partitioned with k-means,
+    a query only compares itself with the rows in the partitions whose centroids are nearest. More lists make every
+    list smaller and the search faster, more probes raise the recall.
+    """
+    def __init__(self, data, lists=None, probes=4, iterations=10, seed=0):
+        """
+        :param data: matrix with the training data, one row per entry
+        :param lists: amount of partitions, standard is the square root of the amount of rows
+        :param probes: amount of nearest partitions that are searched for every query
+        :param iterations: amount of k-means iterations used to find the partitions
+        :param seed: seed for the random choices of k-means
+        """
+        self.data = np.asarray(data, dtype=float)
+        self.probes = probes
+        lists = lists or max(1, int(np.sqrt(len(self.data))))
+        rng = np.random.default_rng(seed)
+
+        # Train the centroids on a sample, that is enough to get evenly sized partitions
+        sample = self.data[rng.choice(len(self.data), min(len(self.data), 64 * lists), replace=False)]
+        self.centroids = sample[rng.choice(len(sample), lists, replace=False)]
+        for i in range(iterations):
+            assigned = np.argmin(squaredDistances(sample, self.centroids), axis=1)
+            counts = np.bincount(assigned, minlength=lists)
+            sums = np.stack([np.bincount(assigned, sample[:, j], minlength=lists) for j in range(sample.shape[1])], axis=1)
+            # A centroid without rows keeps its position
+            filled = counts > 0
+            self.centroids[filled] = sums[filled] / counts[filled, None]
+
+        assigned = np.concatenate([np.argmin(squaredDistances(self.data[start:start + 65536], self.centroids), axis=1)
+                                   for start in range(0, len(self.data), 65536)])
+        # Rows sorted per list, list i holds the rows self.order[self.bounds[i]:self.bounds[i + 1]]
+        self.order = np.argsort(assigned, kind='stable')
+        self.bounds = np.concatenate(([0], np.cumsum(np.bincount(assigned, minlength=lists))))
+
+    def query(self, arrays, k):
+        """
+        Find (approximately) the k nearest training rows of every query
+        :param arrays: matrix with one query per row
+        :param k: amount of neighbours to find
+        :return: tuple of (squared distances, training row indices), both (queries, k) and nearest first
+        """
+        arrays = np.atleast_2d(np.asarray(arrays, dtype=float))
+        k = min(k, len(self.data))
+        nearest = np.empty((len(arrays), k), dtype=int)
+        nearestDistances = np.empty((len(arrays), k))
+        listOrder = np.argsort(squaredDistances(arrays, self.centroids), axis=1)
+        sizes = np.diff(self.bounds)
+        for i in range(len(arrays)):
+            # Use at least the requested amount of probes, and more when those lists hold less than k rows
+            probes = max(self.probes, np.searchsorted(np.cumsum(sizes[listOrder[i]]), k) + 1)
+            candidates = np.concatenate([self.order[self.bounds[j]:self.bounds[j + 1]] for j in listOrder[i, :probes]])
+            difference = self.data[candidates] - arrays[i]
+            distances = np.einsum('ij,ij->i', difference, difference)
+            order = np.lexsort((candidates, distances))[:k]
+            nearest[i], nearestDistances[i] = candidates[order], distances[order]
+        return nearestDistances, nearest
+
+## measureRecall
+#
+#  Fraction of the exact k nearest neighbours that the approximate index also finds.
+#  @param approximate: index to measure, like IVFIndex
+#  @param arrays: matrix with the queries to measure the recall on
+#  @param data: the training data, used for the exact search
+#  @param k: amount of neighbours to compare
+def measureRecall(approximate, arrays, data, k):
+    exactNearest = buildIndex(data).query(arrays, k)[1]
+    approximateNearest = approximate.query(arrays, k)[1]
+    found = sum(np.isin(exact, found).sum() for exact, found in zip(exactNearest, approximateNearest))
+    return found / exactNearest.size
+
+if __name__ == '__main__':
+    from kNNBatch import getSeasonLabels
+    from weatherData import loadWeatherData, seasonLabels
+
+    dates, data = loadWeatherData('Dataset/dataset1.csv')
+    labels = seasonLabels(dates)
+    datesValidation, dataValidation = loadWeatherData('Dataset/validation1.csv')
+    labelsValidation = seasonLabels(datesValidation)
+
+    k = 59
+    exactLabels = getSeasonLabels(dataValidation, data, labels, k)
+    for probes in [1, 2, 4, 8]:
+        index = IVFIndex(data, probes=probes)
+        approximateLabels = getSeasonLabels(dataValidation, index, labels, k)
+        print("Probes: {} recall: {:.3f} same label as exact search: {:.1f}% hit percentage: {:.1f}%".format(
+            probes, measureRecall(index, dataValidation, data, k), (approximateLabels == exactLabels).mean() * 100,
+            (approximateLabels == labelsValidation).mean() * 100))
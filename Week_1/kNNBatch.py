@@ -0,0 +1,94 @@
+import numpy as np
+from kNNIndex import buildIndex, maxBatchElements
+
+## firstOfEqualDistance
+#
+#  The original per-row getSeasonLabel of kNN.py looked neighbours up with distances.index(), so neighbours at the
+#  same distance all got the label of the first training row at that distance. This does the same for a nearest
+#  first list of neighbours, so the results did not change.
+#  @param nearest: matrix with neighbour indices, nearest first and equal distances ordered by index
+#  @param nearestDistances: matrix with the distances belonging to nearest
+def firstOfEqualDistance(nearest, nearestDistances):
+    positions = np.arange(nearest.shape[1])
+    start = np.ones(nearest.shape, dtype=bool)
+    start[:, 1:] = nearestDistances[:, 1:] != nearestDistances[:, :-1]
+    first = np.maximum.accumulate(np.where(start, positions, 0), axis=1)
+    return np.take_along_axis(nearest, first, axis=1)
+
+## vote
+#
+#  Majority vote over the labels of the neighbours. When several labels have the same amount of votes, the label
+#  that is encountered first (so the nearest neighbour) wins, which is the same rule the original getSeasonLabel used.
+#  @param neighbourLabels: matrix with the label codes of the neighbours, nearest neighbour first
+#  @param optionAmount: the amount of different label codes
+def vote(neighbourLabels, optionAmount):
+    amount, k = neighbourLabels.shape
+    keys = (np.arange(amount)[:, None] * optionAmount + neighbourLabels).ravel()
+    counts = np.bincount(keys, minlength=amount * optionAmount).reshape(amount, optionAmount)
+
+    # Position of the first occurrence of every label, labels that do not occur get position k
+    first = np.full(amount * optionAmount, k)
+    uniqueKeys, firstIndex = np.unique(keys, return_index=True)
+    first[uniqueKeys] = firstIndex % k
+    first = first.reshape(amount, optionAmount)
+
+    return np.argmax(counts * (k + 1) - first, axis=1)
+
+## getSeasonLabels
+#
+#  Batch version of the original per-row getSeasonLabel, determines the label of every row in arrays in one call.
+#  @param arrays: matrix with one entry per row to get the season label for
+#  @param data: data which will be used to determine the label, either a matrix or an index made by buildIndex
+#  @param labels: the labels that belong to the rows of data
+#  @param k: the k represents what k means in k Nearest Neighbour
+def getSeasonLabels(arrays, data, labels, k):
+    index = data if hasattr(data, 'query') else buildIndex(data)
+    options, codes = np.unique(np.asarray(labels), return_inverse=True)
+
+    nearestDistances, nearest = index.query(arrays, k)
+    nearest = firstOfEqualDistance(nearest, nearestDistances)
+    return options[vote(codes[nearest], len(options))]
+
+## countHits
+#
+#  Amount of correct votes for every k from 1 to the amount of neighbours, using running counts per label.
+#  @param neighbourLabels: matrix with the label codes of the neighbours, nearest neighbour first
+#  @param expected: the correct label code of every row, -1 for a label none of the neighbours can have
+#  @param optionAmount: the amount of different label codes
+def countHits(neighbourLabels, expected, optionAmount):
+    maxK = neighbourLabels.shape[1]
+    # counts[i, j, c] is the amount of label c within the j + 1 nearest neighbours of row i
+    counts = np.cumsum(neighbourLabels[:, :, None] == np.arange(optionAmount), axis=1)
+    # Position of the first occurrence of every label, used to break ties just like vote does
+    first = np.where(counts[:, -1, :] > 0, np.argmax(counts > 0, axis=1), maxK)
+
+    winners = np.argmax(counts * (maxK + 1) - first[:, None, :], axis=2)
+    return (winners == np.asarray(expected)[:, None]).sum(axis=0)
+
+## getHitCurve
+#
+#  Amount of correctly labeled rows for every k from 1 to maxK. The neighbours of every row are sorted only once,
+#  after which every k is scored from running counts per label instead of searching the neighbours again.
+#  @param arrays: matrix with one entry per row to get the season label for
+#  @param expected: the correct labels of the rows in arrays
+#  @param data: data which will be used to determine the label, either a matrix or an index made by buildIndex
+#  @param labels: the labels that belong to the rows of data
+#  @param maxK: the largest k to score
+def getHitCurve(arrays, expected, data, labels, maxK):
+    index = data if hasattr(data, 'query') else buildIndex(data)
+    options, codes = np.unique(np.asarray(labels), return_inverse=True)
+    arrays = np.atleast_2d(np.asarray(arrays, dtype=float))
+    maxK = min(maxK, len(codes))
+
+    # Expected labels as codes, a label that is not in the training labels can never be hit
+    expected = np.asarray(expected)
+    position = np.minimum(np.searchsorted(options, expected), len(options) - 1)
+    expected = np.where(options[position] == expected, position, -1)
+
+    hits = np.zeros(maxK, dtype=int)
+    batchSize = max(1, maxBatchElements // (maxK * len(options)))
+    for start in range(0, len(arrays), batchSize):
+        nearestDistances, nearest = index.query(arrays[start:start + batchSize], maxK)
+        neighbourLabels = codes[firstOfEqualDistance(nearest, nearestDistances)]
+        hits += countHits(neighbourLabels, expected[start:start + batchSize], len(options))
+    return hits
@@ -0,0 +1,98 @@
+import json, sys, time
+import numpy as np
+from kNNApprox import IVFIndex
+from kNNBatch import getSeasonLabels, getHitCurve
+from kNNIndex import buildIndex
+from weatherData import loadWeatherData, seasonLabels
+
+# Sizes of the synthetic training data
+sizes = [1000, 10000, 100000, 1000000]
+# Ways to build the index that are benchmarked
+backends = {'brute': lambda data: buildIndex(data, 'brute'),
+            'kdtree': lambda data: buildIndex(data, 'kdtree'),
+            'ivf': lambda data: IVFIndex(data)}
+batchQueries = 1000
+sweepQueries = 100
+sweepMaxK = 50
+k = 59
+repeats = 3
+# A result is flagged as slower when it takes this fraction more time than the baseline
+tolerance = 0.2
+# Differences smaller than this amount of seconds are seen as noise
+minimumDifference = 0.001
+
+## syntheticWeather
+#
+#  Random weather data with the same mean and covariance as dataset1.csv, rounded to integers like the real data.
+#  @param amount: amount of rows
+#  @param rng: numpy random generator
+def syntheticWeather(amount, rng):
+    dates, data = loadWeatherData('Dataset/dataset1.csv')
+    rows = rng.multivariate_normal(data.mean(axis=0), np.cov(data, rowvar=False), amount).round()
+    # Dates of a year starting at 2000-01-01, repeated, so every season occurs
+    labels = seasonLabels(np.resize(dates, amount))
+    return rows, labels
+
+## timeIt
+#
+#  @param function: function without arguments to time
+#  @return the fastest time in seconds out of the repeats
+def timeIt(function, repeat=repeats):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+## runBenchmarks
+#
+#  Time building the index, a single query, a batch query and a k-sweep for every size and backend.
+#  @param seed: seed for the synthetic data
+#  @return dictionary of 'backend/size/measurement' to seconds
+def runBenchmarks(seed=0):
+    rng = np.random.default_rng(seed)
+    results = {}
+    for size in sizes:
+        data, labels = syntheticWeather(size, rng)
+        queries, expected = syntheticWeather(batchQueries, rng)
+        for name, build in backends.items():
+            key = '{}/{}/'.format(name, size)
+            start = time.perf_counter()
+            index = build(data)
+            results[key + 'fit'] = time.perf_counter() - start
+            results[key + 'single'] = timeIt(lambda: getSeasonLabels(queries[:1], index, labels, k))
+            results[key + 'batch'] = timeIt(lambda: getSeasonLabels(queries, index, labels, k), 1)
+            results[key + 'sweep'] = timeIt(lambda: getHitCurve(queries[:sweepQueries], expected[:sweepQueries],
+                                                                 index, labels, sweepMaxK), 1)
+            print("{:20} fit: {:.4f}s single: {:.4f}s batch: {:.4f}s sweep: {:.4f}s".format(
+                key[:-1], *[results[key + measurement] for measurement in ['fit', 'single', 'batch', 'sweep']]))
+    return results
+
+## compareBaseline
+#
+#  @param results: dictionary made by runBenchmarks
+#  @param baseline: dictionary made by an earlier run of runBenchmarks
+#  @return list of (key, baseline seconds, seconds) of the results that are slower than the baseline
+def compareBaseline(results, baseline):
+    return [(key, baseline[key], seconds) for key, seconds in results.items()
+            if key in baseline and seconds > baseline[key] * (1 + tolerance)
+            and seconds - baseline[key] > minimumDifference]
+
+if __name__ == '__main__':
+    if len(sys.argv) not in [2, 3]:
+        print("Usage: python kNNBenchmark.py <output json> [baseline json]")
+        exit()
+
+    results = runBenchmarks()
+    with open(sys.argv[1], 'w') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+    if len(sys.argv) == 3:
+        with open(sys.argv[2]) as file:
+            slower = compareBaseline(results, json.load(file))
+        for key, before, after in slower:
+            print("SLOWER: {} took {:.4f}s, baseline was {:.4f}s".format(key, after, before))
+        if slower:
+            exit(1)
+        print("No results are slower than the baseline")
@@ -0,0 +1,83 @@
+import os, tempfile
+import multiprocessing
+import numpy as np
+from kNNBatch import firstOfEqualDistance, countHits
+from kNNIndex import squaredDistances, kSmallest
+
+# Training data, label codes and folds of a worker process, set once by initWorker
+worker = {}
+
+## initWorker
+#
+#  Runs once in every worker process, the arrays are memory mapped so all workers share the same pages.
+#  @param directory: directory with the data.npy, codes.npy and folds.npy files
+#  @param maxK: the largest k to score
+#  @param optionAmount: the amount of different label codes
+def initWorker(directory, maxK, optionAmount):
+    for name in ['data', 'codes', 'folds']:
+        worker[name] = np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+    worker['maxK'] = maxK
+    worker['optionAmount'] = optionAmount
+
+## scoreBlock
+#
+#  Hits for every k of the rows start:end. The distances from those rows to all rows are computed at once, the rows
+#  in the same fold (for leave-one-out only the row itself) are left out of the neighbours.
+#  @param block: tuple of (start, end)
+def scoreBlock(block):
+    start, end = block
+    data, codes, folds = worker['data'], worker['codes'], worker['folds']
+    distances = squaredDistances(np.asarray(data[start:end]), np.asarray(data))
+    distances[folds[start:end, None] == folds[None, :]] = np.inf
+
+    nearest = kSmallest(distances, worker['maxK'])
+    nearest = firstOfEqualDistance(nearest, np.take_along_axis(distances, nearest, axis=1))
+    return countHits(codes[nearest], codes[start:end], worker['optionAmount'])
+
+## crossValidate
+#
+#  Hit percentage for every k from 1 to maxK using leave-one-out or k-fold cross validation on all data. The rows
+#  are processed in blocks so the distances never take more than memoryLimit bytes per process, and the blocks are
+#  divided over a pool of processes.
+#  @param data: matrix with the training data
+#  @param labels: the labels that belong to the rows of data
+#  @param maxK: the largest k to score
+#  @param folds: amount of folds, None for leave-one-out
+#  @param memoryLimit: maximum amount of bytes used for the distances of one block
+#  @param processes: amount of worker processes, default is the amount of cpu's
+#  @param seed: seed for the random division of the rows over the folds
+def crossValidate(data, labels, maxK, folds=None, memoryLimit=2 ** 28, processes=None, seed=0):
+    data = np.asarray(data, dtype=float)
+    options, codes = np.unique(np.asarray(labels), return_inverse=True)
+    if folds is None:
+        foldOf = np.arange(len(data))
+    else:
+        foldOf = np.random.default_rng(seed).permutation(len(data)) % folds
+    # A row can only use the rows outside its fold as neighbours
+    maxK = min(maxK, len(data) - np.bincount(foldOf).max())
+
+    # Distances, their sort order and the running counts per label are in memory at the same time
+    rowBytes = 8 * (3 * len(data) + 2 * maxK * len(options))
+    blockSize = max(1, memoryLimit // rowBytes)
+    blocks = [(start, min(start + blockSize, len(data))) for start in range(0, len(data), blockSize)]
+
+    hits = np.zeros(maxK, dtype=int)
+    with tempfile.TemporaryDirectory() as directory:
+        np.save(os.path.join(directory, 'data.npy'), data)
+        np.save(os.path.join(directory, 'codes.npy'), codes)
+        np.save(os.path.join(directory, 'folds.npy'), foldOf)
+        with multiprocessing.Pool(processes, initWorker, (directory, maxK, len(options))) as pool:
+            for blockHits in pool.imap_unordered(scoreBlock, blocks):
+                hits += blockHits
+    return hits / len(data) * 100
+
+if __name__ == '__main__':
+    from weatherData import loadWeatherData, seasonLabels
+
+    dates, data = loadWeatherData('Dataset/dataset1.csv')
+    labels = seasonLabels(dates)
+    for folds in [None, 10]:
+        percentages = crossValidate(data, labels, len(data) - 1, folds)
+        print("{}: the best k to use is {} and it had a hit percentage of {}%".format(
+            "Leave-one-out" if folds is None else "{}-fold".format(folds),
+            np.argmax(percentages) + 1, percentages.max()))
@@ -0,0 +1,186 @@
+import heapq
+import numpy as np
+
+# Amount of distance entries (queries x training rows) that are held in memory at once
+maxBatchElements = 2 ** 22
+
+# buildIndex only uses a KD-tree from this amount of training rows, below it brute force is faster
+treeMinimumRows = 100000
+# Above this amount of features a KD-tree has to visit nearly every leaf, so brute force is used instead
+treeMaximumFeatures = 12
+
+## squaredDistances
+#
+#  Squared euclidean distance from every query row to every training row, computed with one matrix product.
+#  The weather data only contains integers, so the result is exact and gives the same ordering as the loop
+#  in the original getSeasonLabel.
+#  @param arrays: matrix with one query per row
+#  @param data: matrix with the training data
+def squaredDistances(arrays, data):
+    distances = (arrays ** 2).sum(axis=1)[:, None] - 2 * arrays @ data.T + (data ** 2).sum(axis=1)[None, :]
+    return np.maximum(distances, 0, out=distances)
+
+## kSmallest
+#
+#  Indices of the k smallest distances of every row, ordered from nearest to furthest. Equal distances are ordered
+#  by training row index, like sorted() did in the original getSeasonLabel.
+#  @param distances: matrix with the distances of every query to every training row
+#  @param k: the amount of neighbours to select
+def kSmallest(distances, k):
+    if k >= distances.shape[1]:
+        return np.argsort(distances, axis=1, kind='stable')[:, :k]
+
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    nearestDistances = np.take_along_axis(distances, nearest, axis=1)
+    order = np.lexsort((nearest, nearestDistances))
+    nearest = np.take_along_axis(nearest, order, axis=1)
+
+    # argpartition picks an arbitrary row when several rows share the k-th distance, sort those queries fully
+    kthDistance = np.take_along_axis(distances, nearest[:, -1:], axis=1)
+    ties = (distances <= kthDistance).sum(axis=1) > k
+    if ties.any():
+        nearest[ties] = np.argsort(distances[ties], axis=1, kind='stable')[:, :k]
+    return nearest
+
+class BruteForce:
+    """
+    Exact nearest neighbour search that compares every query with every training row
+    """
+    def __init__(self, data):
+        """
+        :param data: matrix with the training data, one row per entry
+        """
+        self.data = np.asarray(data, dtype=float)
+
+    def query(self, arrays, k):
+        """
+        Find the k nearest training rows of every query
+        :param arrays: matrix with one query per row
+        :param k: amount of neighbours to find
+        :return: tuple of (squared distances, training row indices), both (queries, k) and nearest first
+        """
+        k = min(k, len(self.data))
+        arrays = np.atleast_2d(np.asarray(arrays, dtype=float))
+        nearest = np.empty((len(arrays), k), dtype=int)
+        nearestDistances = np.empty((len(arrays), k))
+        batchSize = max(1, maxBatchElements // len(self.data))
+        for start in range(0, len(arrays), batchSize):
+            distances = squaredDistances(arrays[start:start + batchSize], self.data)
+            nearest[start:start + batchSize] = kSmallest(distances, k)
+            nearestDistances[start:start + batchSize] = np.take_along_axis(distances, nearest[start:start + batchSize], axis=1)
+        return nearestDistances, nearest
+
+class KDTree:
+    """
+    Exact nearest neighbour search using a KD-tree. The tree is built once, after that every query only visits the
+    leaves that can still contain one of the k nearest rows.
+    """
+    def __init__(self, data, leafSize=128):
+        """
+        Build the tree by splitting every node on the median of its widest feature
+        :param data: matrix with the training data, one row per entry
+        :param leafSize: maximum amount of rows in a leaf
+        """
+        data = np.asarray(data, dtype=float)
+        self.data = data
+        order = np.arange(len(data))
+
+        self.start, self.end, self.left, self.right, self.lower, self.upper = [], [], [], [], [], []
+        stack = [(self.addNode(data, order, 0, len(data)), 0, len(data))]
+        while stack:
+            node, start, end = stack.pop()
+            if end - start <= leafSize:
+                continue
+            points = data[order[start:end]]
+            feature = np.argmax(self.upper[node] - self.lower[node])
+            middle = (end - start) // 2
+            split = np.argpartition(points[:, feature], middle)
+            order[start:end] = order[start:end][split]
+            self.left[node] = self.addNode(data, order, start, start + middle)
+            self.right[node] = self.addNode(data, order, start + middle, end)
+            stack.append((self.left[node], start, start + middle))
+            stack.append((self.right[node], start + middle, end))
+
+        self.points = data[order]
+        self.indices = order
+        self.lower = np.array(self.lower)
+        self.upper = np.array(self.upper)
+
+    def addNode(self, data, order, start, end):
+        """
+        Add a node with the bounding box of the rows order[start:end]
+        :return: the number of the new node
+        """
+        points = data[order[start:end]]
+        self.start.append(start)
+        self.end.append(end)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.lower.append(points.min(axis=0))
+        self.upper.append(points.max(axis=0))
+        return len(self.start) - 1
+
+    def boxDistance(self, array, node):
+        """
+        :return: the smallest possible squared distance from array to a row inside the bounding box of node
+        """
+        outside = np.maximum(self.lower[node] - array, 0) + np.maximum(array - self.upper[node], 0)
+        return float(outside @ outside)
+
+    def queryOne(self, array, k):
+        """
+        Best first search for the k nearest rows of a single query
+        :return: tuple of (squared distances, training row indices), nearest first
+        """
+        bestDistances = np.full(k, np.inf)
+        bestIndices = np.full(k, len(self.data))
+        heap = [(0.0, 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            # A node at the same distance as the k-th neighbour can still hold a row with a lower index
+            if bound > bestDistances[-1]:
+                break
+            if self.left[node] == -1:
+                start, end = self.start[node], self.end[node]
+                difference = self.points[start:end] - array
+                distances = np.concatenate((bestDistances, np.einsum('ij,ij->i', difference, difference)))
+                indices = np.concatenate((bestIndices, self.indices[start:end]))
+                order = np.lexsort((indices, distances))[:k]
+                bestDistances, bestIndices = distances[order], indices[order]
+            else:
+                for child in (self.left[node], self.right[node]):
+                    heapq.heappush(heap, (self.boxDistance(array, child), child))
+        return bestDistances, bestIndices
+
+    def query(self, arrays, k):
+        """
+        Find the k nearest training rows of every query
+        :param arrays: matrix with one query per row
+        :param k: amount of neighbours to find
+        :return: tuple of (squared distances, training row indices), both (queries, k) and nearest first
+        """
+        arrays = np.atleast_2d(np.asarray(arrays, dtype=float))
+        k = min(k, len(self.data))
+        nearest = np.empty((len(arrays), k), dtype=int)
+        nearestDistances = np.empty((len(arrays), k))
+        for i in range(len(arrays)):
+            nearestDistances[i], nearest[i] = self.queryOne(arrays[i], k)
+        return nearestDistances, nearest
+
+## buildIndex
+#
+#  Build the nearest neighbour index for the training data once, so it can be reused for every query.
+#  @param data: matrix with the training data
+#  @param backend: 'brute', 'kdtree' or 'auto', auto picks the KD-tree for many rows with few features
+def buildIndex(data, backend='auto'):
+    data = np.asarray(data, dtype=float)
+    if backend == 'auto':
+        useTree = len(data) >= treeMinimumRows and data.shape[1] <= treeMaximumFeatures
+        backend = 'kdtree' if useTree else 'brute'
+    if backend == 'brute':
+        return BruteForce(data)
+    elif backend == 'kdtree':
+        return KDTree(data)
+    else:
+        print("ERROR: Unknown backend '{}', use 'brute', 'kdtree' or 'auto'".format(backend))
+        exit()
@@ -0,0 +1,96 @@
+import json, os, sys
+import numpy as np
+from kNNApprox import IVFIndex
+from kNNBatch import getSeasonLabels, getHitCurve
+from kNNIndex import BruteForce, KDTree, buildIndex
+
+# Index classes that can be stored in a model
+indexClasses = {'BruteForce': BruteForce, 'KDTree': KDTree, 'IVFIndex': IVFIndex}
+
+## bestK
+#
+#  The k with the highest hit percentage on the validation data, the lowest k wins when several are equally good.
+#  @param index: index made by buildIndex
+#  @param labels: the labels that belong to the training data
+#  @param dataValidation: matrix with the validation data
+#  @param labelsValidation: the labels of the validation data
+def bestK(index, labels, dataValidation, labelsValidation):
+    return int(np.argmax(getHitCurve(dataValidation, labelsValidation, index, labels, len(labels) - 1))) + 1
+
+## fitModel
+#
+#  Build the index and store everything needed for predictions in the directory path: the training matrix, the
+#  labels, k and the arrays of the index. Every array is stored as its own .npy file, so loadModel can memory map
+#  them without parsing or copying anything.
+#  @param path: directory to store the model in
+#  @param data: matrix with the training data
+#  @param labels: the labels that belong to the rows of data
+#  @param k: the k to use for predictions, or None to choose the best k on the validation data
+#  @param validation: tuple of (validation data, validation labels), needed when k is None
+#  @param backend: 'brute', 'kdtree' or 'auto', see buildIndex, or an index that is already built
+def fitModel(path, data, labels, k=None, validation=None, backend='auto'):
+    index = backend if hasattr(backend, 'query') else buildIndex(data, backend)
+    if k is None:
+        k = bestK(index, labels, *validation)
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'labels.npy'), np.asarray(labels))
+    meta = {'k': k, 'index': type(index).__name__, 'arrays': [], 'lists': [], 'values': {}}
+    for name, value in vars(index).items():
+        if isinstance(value, np.ndarray):
+            meta['arrays'].append(name)
+        elif isinstance(value, list):
+            meta['lists'].append(name)
+        else:
+            meta['values'][name] = value
+            continue
+        np.save(os.path.join(path, name + '.npy'), np.asarray(value))
+    with open(os.path.join(path, 'model.json'), 'w') as file:
+        json.dump(meta, file)
+    return k
+
+## loadModel
+#
+#  Load a model stored by fitModel, the arrays are memory mapped so this is fast even for large training data.
+#  @param path: directory the model is stored in
+#  @return tuple of (index, labels, k)
+def loadModel(path):
+    with open(os.path.join(path, 'model.json')) as file:
+        meta = json.load(file)
+
+    # The index is restored from its stored arrays instead of being built again
+    index = object.__new__(indexClasses[meta['index']])
+    for name in meta['arrays']:
+        setattr(index, name, np.load(os.path.join(path, name + '.npy'), mmap_mode='r'))
+    for name in meta['lists']:
+        setattr(index, name, np.load(os.path.join(path, name + '.npy')).tolist())
+    for name, value in meta['values'].items():
+        setattr(index, name, value)
+
+    return index, np.load(os.path.join(path, 'labels.npy'), mmap_mode='r'), meta['k']
+
+## predict
+#
+#  @param path: directory the model is stored in
+#  @param arrays: matrix with one entry per row to get the season label for
+def predict(path, arrays):
+    index, labels, k = loadModel(path)
+    return getSeasonLabels(arrays, index, labels, k)
+
+if __name__ == '__main__':
+    from weatherData import loadWeatherData, seasonLabels, seasonNames
+
+    if len(sys.argv) == 3 and sys.argv[1] == 'fit':
+        dates, data = loadWeatherData('Dataset/dataset1.csv')
+        datesValidation, dataValidation = loadWeatherData('Dataset/validation1.csv')
+        k = fitModel(sys.argv[2], data, seasonLabels(dates), validation=(dataValidation, seasonLabels(datesValidation)))
+        print("Stored model with k={} in {}".format(k, sys.argv[2]))
+    elif len(sys.argv) == 4 and sys.argv[1] == 'predict':
+        days = np.genfromtxt(sys.argv[3], delimiter=';', usecols=[1,2,3,4,5,6,7], ndmin=2)
+        counter = 1
+        for season in predict(sys.argv[2], days):
+            print("Day number {}, is in season: {}".format(counter, seasonNames[season]))
+            counter += 1
+    else:
+        print("Usage: python kNNModel.py fit <model directory>")
+        print("       python kNNModel.py predict <model directory> <days file>")
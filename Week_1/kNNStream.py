@@ -0,0 +1,93 @@
+import itertools, os, sys, tempfile
+import multiprocessing
+from collections import deque
+import numpy as np
+from kNNBatch import getSeasonLabels
+from kNNIndex import buildIndex
+from kNNModel import bestK, fitModel, loadModel
+from weatherData import seasonNames
+
+# Index, labels and k of a worker process, set once by initWorker
+worker = {}
+
+## readChunks
+#
+#  Read a days.csv style file in pieces, so only one chunk of the file is in memory at a time.
+#  @param path: path to the file with one day per line
+#  @param chunkSize: amount of lines per chunk
+def readChunks(path, chunkSize):
+    with open(path) as file:
+        while True:
+            lines = list(itertools.islice(file, chunkSize))
+            if not lines:
+                return
+            # Only trailing empty lines are left, genfromtxt would warn about an empty input
+            if not any(line.strip() for line in lines):
+                continue
+            yield np.genfromtxt(lines, delimiter=';', usecols=[1,2,3,4,5,6,7], ndmin=2)
+
+## initWorker
+#
+#  Runs once in every worker process. The index is built once by scoreFile and stored like a model (see fitModel),
+#  every worker memory maps its arrays, so all workers share the same pages instead of each building its own index.
+#  @param modelPath: directory with the stored index, labels and k
+def initWorker(modelPath):
+    worker['index'], worker['labels'], worker['k'] = loadModel(modelPath)
+
+## scoreChunk
+#
+#  @param chunk: matrix with days to determine the season of
+def scoreChunk(chunk):
+    return getSeasonLabels(chunk, worker['index'], worker['labels'], worker['k'])
+
+## scoreFile
+#
+#  Determine the season of every day in a (possibly huge) days.csv style file. The file is read in chunks which are
+#  labeled by a pool of processes that share one index, results are written to outputPath in input order as soon as
+#  they are ready.
+#  At most two chunks per process are in flight, so memory does not grow with the size of the file.
+#  @param inputPath: path to the file with the days to label
+#  @param outputPath: path of the file to write one season per line to
+#  @param data: data which will be used to determine the label
+#  @param labels: the labels that belong to the rows of data
+#  @param k: the k represents what k means in k Nearest Neighbour
+#  @param chunkSize: amount of days per chunk
+#  @param processes: amount of worker processes, default is the amount of cpu's
+#  @param backend: 'brute', 'kdtree' or 'auto', see buildIndex
+#  @param names: name of every label code that is written to the file, None writes the label codes themselves
+def scoreFile(inputPath, outputPath, data, labels, k, chunkSize=100000, processes=None, backend='auto',
+              names=seasonNames):
+    processes = processes or os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        # The index is built once here, the workers only memory map its stored arrays
+        fitModel(directory, data, labels, k, backend=backend)
+
+        with multiprocessing.Pool(processes, initWorker, (directory,)) as pool, \
+                open(outputPath, 'w') as output:
+            def write(seasons):
+                output.writelines(str(season) + '\n' for season in (seasons if names is None else names[seasons]))
+
+            pending = deque()
+            for chunk in readChunks(inputPath, chunkSize):
+                pending.append(pool.apply_async(scoreChunk, (chunk,)))
+                if len(pending) >= 2 * processes:
+                    write(pending.popleft().get())
+            while pending:
+                write(pending.popleft().get())
+
+if __name__ == '__main__':
+    from weatherData import loadWeatherData, seasonLabels
+
+    if len(sys.argv) in (3, 4):
+        dates, data = loadWeatherData('Dataset/dataset1.csv')
+        labels = seasonLabels(dates)
+        if len(sys.argv) == 4:
+            k = int(sys.argv[3])
+        else:
+            # No k given, use the best k on the validation data like kNNModel.py does
+            datesValidation, dataValidation = loadWeatherData('Dataset/validation1.csv')
+            k = bestK(buildIndex(data), labels, dataValidation, seasonLabels(datesValidation))
+        scoreFile(sys.argv[1], sys.argv[2], data, labels, k)
+        print("Wrote the season of every day in {} to {} with k={}".format(sys.argv[1], sys.argv[2], k))
+    else:
+        print("Usage: python kNNStream.py <days file> <output file> [k]")
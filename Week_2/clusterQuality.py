@@ -0,0 +1,95 @@
+import numpy as np
+from kMeansCore import assignClusters, centroidDistances
+from kMeansElbow import elbow
+
+## daviesBouldin
+#
+#  Davies-Bouldin index: for every cluster the worst ratio of (spread of both clusters) / (distance between their
+#  centroids), averaged over the clusters. Lower is better.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the centroids
+#  @param clusters: cluster index of every row
+def daviesBouldin(data, centroids, clusters):
+    k = len(centroids)
+    if k < 2:
+        return np.nan
+    difference = data - centroids[clusters]
+    # Spread of a cluster is the mean distance of its rows to the centroid
+    counts = np.bincount(clusters, minlength=k)
+    spread = np.bincount(clusters, np.sqrt(np.einsum('ij,ij->i', difference, difference)), minlength=k)
+    spread = np.divide(spread, counts, out=np.zeros(k), where=counts > 0)
+
+    between = np.sqrt(np.maximum(centroidDistances(centroids, centroids), 0))
+    np.fill_diagonal(between, np.inf)
+    return ((spread[:, None] + spread[None, :]) / between).max(axis=1).mean()
+
+## silhouette
+#
+#  Mean silhouette score of a random sample of the rows, computed within that sample. The distances are computed
+#  for blocks of rows at a time, so only blockSize x sampleSize distances are in memory. Higher is better.
+#  @param data: matrix with one entry per row
+#  @param clusters: cluster index of every row
+#  @param sampleSize: amount of rows in the sample, all rows are used when there are less
+#  @param rng: numpy random generator used for the sample
+#  @param blockSize: amount of rows per block of distances
+def silhouette(data, clusters, sampleSize=2000, rng=None, blockSize=256):
+    rng = rng or np.random.default_rng()
+    sample = np.sort(rng.choice(len(data), min(sampleSize, len(data)), replace=False))
+    points, sampleClusters = np.asarray(data[sample], dtype=float), clusters[sample]
+    k = clusters.max() + 1
+    counts = np.bincount(sampleClusters, minlength=k)
+    if (counts > 0).sum() < 2:
+        return np.nan
+    members = (sampleClusters[:, None] == np.arange(k)).astype(float)
+
+    scores = np.empty(len(points))
+    for start in range(0, len(points), blockSize):
+        block = slice(start, start + blockSize)
+        distances = np.sqrt(np.maximum(centroidDistances(points[block], points), 0))
+        # Sum of the distances from every row in the block to the rows of every cluster
+        sums = distances @ members
+        own = sampleClusters[block]
+        rows = np.arange(len(own))
+        # The row itself is in its own cluster at distance 0, so leave it out of the count
+        a = sums[rows, own] / np.maximum(counts[own] - 1, 1)
+        others = np.divide(sums, counts, out=np.full(sums.shape, np.inf), where=counts > 0)
+        others[rows, own] = np.inf
+        b = others.min(axis=1)
+        score = (b - a) / np.maximum(a, b)
+        # A row that is alone in its cluster gets score 0
+        scores[block] = np.where(counts[own] > 1, score, 0)
+    return scores.mean()
+
+## evaluateK
+#
+#  Cluster the data for every k (best of a number of runs, see elbow) and compute the inertia, Davies-Bouldin index
+#  and silhouette score of each clustering.
+#  @param data: matrix with one entry per row
+#  @param ks: the k's to try
+#  @param runs: amount of k-means runs per k
+#  @param sampleSize: amount of rows used for the silhouette score
+#  @param seed: seed for the k-means runs and the silhouette sample
+#  @return tuple of (table, recommended k), the table has a row (k, inertia, Davies-Bouldin, silhouette) per k and
+#  the recommended k is the one with the highest silhouette score
+def evaluateK(data, ks=range(2, 11), runs=10, sampleSize=2000, seed=0):
+    data = np.asarray(data, dtype=float)
+    best = elbow(data, ks, runs, seed)
+    table = []
+    for k in best:
+        inertia, centroids = best[k]
+        clusters = assignClusters(data, centroids)[0]
+        table.append((k, inertia, daviesBouldin(data, centroids, clusters),
+                      silhouette(data, clusters, sampleSize, np.random.default_rng(seed))))
+    scores = [row[3] for row in table]
+    recommended = table[int(np.nanargmax(scores))][0] if not np.isnan(scores).all() else None
+    return table, recommended
+
+if __name__ == '__main__':
+    from weatherData import loadWeatherData
+
+    dates, data = loadWeatherData('Dataset/dataset1.csv')
+    table, recommended = evaluateK(data)
+    print("{:>3} {:>15} {:>15} {:>11}".format("k", "inertia", "Davies-Bouldin", "silhouette"))
+    for k, inertia, db, score in table:
+        print("{:3} {:15.1f} {:15.4f} {:11.4f}".format(k, inertia, db, score))
+    print("\nThe recommended k is {}".format(recommended))
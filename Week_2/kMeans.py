@@ -1,171 +1,49 @@
-import numpy as np, random, math
+import numpy as np, math
 import matplotlib.pyplot as plt
+from kMeansCore import kMeansPlusPlus, lloyd, hamerly, contingencyTable, clusterPurity
+from kMeansElbow import elbow
+from weatherData import loadWeatherData, seasonLabels, seasonNames
 
 # import training data
-data = np.genfromtxt('Dataset/dataset1.csv', delimiter=';', usecols=[1,2,3,4,5,6,7])
-dates = np.genfromtxt('Dataset/dataset1.csv', delimiter=';', usecols=[0])
-labels = []
-for label in dates:
-    if label < 20000301:
-        labels.append('winter')
-    elif 20000301 <= label < 20000601:
-        labels.append('lente')
-    elif 20000601 <= label < 20000901:
-        labels.append('zomer')
-    elif 20000901 <= label < 20001201:
-        labels.append('herfst')
-    else:
-        labels.append('winter')
+dates, data = loadWeatherData('Dataset/dataset1.csv')
+labels = seasonLabels(dates)
 
 # import validation data
-dataValidation = np.genfromtxt('Dataset/validation1.csv', delimiter=';', usecols=[1,2,3,4,5,6,7])
-
-def getMaxValues(data):
-    # Calculate max values for a good range for random math
-    maxValues= []
-    for i in range(0, len(data[0])):
-        tmp = []
-        for dataEntry in data:
-            tmp.append(dataEntry[i])
-        # Add lowest possible number
-        tmp.sort()
-        maxValues.append([tmp[0]])
-        # Add highest possible number
-        tmp.sort(reverse=True)
-        maxValues[i] += [tmp[0]]
-    return maxValues
-
-def getRandomPoints(values, k):
-    points = []
-    for i in range(0, k):
-        point = []
-        for value in values:
-            point.append(random.randrange(value[0], value[1]))
-        points.append(point)
-    return points
-
-def closestCluster(entry, clusters):
-    # Calculate distances
-    distances = []
-    for cluster in clusters:
-        distance = 0
-        for j in range(0, len(entry)):
-            distance += ((entry[j]-cluster[j])**2)
-        distances.append(math.sqrt(distance))
-
-    # Get the labels k number of lowest distances
-    lowest = sorted(distances)
-    return clusters[distances.index(lowest[0])]
-
-def assignToCluster(clusters, data):
-    assigned = {}
-    for entry in data:
-        closest = str(closestCluster(entry, clusters))
-        if closest in assigned:
-            tmp = assigned[closest]
-            tmp.append(entry)
-            assigned[closest] = tmp
-        else:
-            assigned[closest] = [entry]
-    return assigned
-
-def getNewCentroid(data, length):
-    centroid = []
-    for i in range(0, length):
-        tmp = 0
-        for j in range(0, len(data)):
-            tmp += data[j][i]
-        mean = tmp/(j+1)
-        centroid.append(mean)
-    return centroid
-
-def getNewCentroids(data):
-    centroids = []
-    for i in data:
-        centroids.append(getNewCentroid(data[i], len(data[i][0])))
-    return centroids
-
-def kMeans(data, k):
-    maxValues = getMaxValues(data)
-    centroids = getRandomPoints(maxValues, k)
-    assigned = assignToCluster(centroids, data)
-
-    #recalculate centroids until there is something assigned to every one
-    tmp = 0
-    while tmp < k:
-        tmp = 0
-        for i in assigned:
-            tmp+=1
-        if tmp < k:
-            centroids = getRandomPoints(maxValues, k)
-            assigned = assignToCluster(centroids, data)
-
-    while True:
-        tmp = assigned
-        centroids = getNewCentroids(assigned)
-        assigned = assignToCluster(centroids, data)
-        # check whether the classes differ
-        check = True
-        for j in range(k):
-            for l in range(len(assigned[list(assigned.keys())[j]])):
-                try:
-                    if assigned[list(assigned.keys())[j]][l].all() != tmp[list(tmp.keys())[j]][l].all():
-                        check = False
-                except IndexError:
-                    check = False
-        if check:
-            return assigned
-
-def calculateIntraclusterDistance(means):
-    intraDistance = 0
-    for centroid in means:
-        distance = 0
-        # create list of a string
-        tmp = []
-        for i in centroid.strip('[]').replace(",", "").split():
-            tmp.append(float(i))
-
-        # calculate distances
-        for cluster in means[centroid]:
-            distance = 0
-            for j in range(len(tmp)):
-                distance += ((tmp[j]-cluster[j])**2)
-            distance += math.sqrt(distance)
-        intraDistance += distance
-    return intraDistance
-
-## DETERMINE LABELS
-means = kMeans(data, 4)
-labelOptions = ['winter', 'herfst', 'zomer', 'lente']
-counter = 1
-for i in means:
-    tmp = []
-    for j in means[i]:
-        for index in range(len(data)):
-            if str(j) == str(data[index]):
-                tmp.append(labels[index])
-                break
-
-    solution = ''
-    amount = -1
-    for option in labelOptions:
-        print(option, tmp.count(option))
-        if tmp.count(option) > amount:
-            solution = option
-            amount = tmp.count(option)
-    print("Cluster {} is season '{}'".format(counter, solution))
-    counter += 1
-
-## PLOTTEN
-y = []
-x = []
-for k in range(1, 11):
-    distance = []
-    for j in range(10):
-        means = kMeans(data, k)
-        distance.append(calculateIntraclusterDistance(means))
-    x.append(k)
-    y.append(sorted(distance)[0])
+datesValidation, dataValidation = loadWeatherData('Dataset/validation1.csv')
+
+def kMeans(data, k, greedy=False, rng=None, accelerated=False, tolerance=0.0, maxIterations=300):
+    rng = rng or np.random.default_rng()
+    # Greedy k-means++ tries 2 + log(k) candidates for every centroid
+    candidates = 2 + int(math.log(k)) if greedy else 1
+    centroids = kMeansPlusPlus(data, k, rng, candidates)
+    if accelerated:
+        # Same clustering as lloyd, but skips the distance calculations that can not change the assignment
+        centroids, clusters, inertia, skipped = hamerly(data, centroids, rng, tolerance, maxIterations)
+        print("Hamerly skipped {} distance calculations for k={}".format(skipped, k))
+    else:
+        centroids, clusters, inertia = lloyd(data, centroids, rng, tolerance, maxIterations)
+    return centroids, clusters, inertia
+
+if __name__ == '__main__':
+    ## DETERMINE LABELS
+    centroids, clusters, inertia = kMeans(data, 4)
+    labelOptions = [3, 2, 1, 0]  # winter, herfst, zomer, lente
+    # Amount of every season per cluster, the columns in the order of labelOptions
+    table = contingencyTable(clusters, labels, len(centroids), len(seasonNames))[:, labelOptions]
+    purity, totalPurity = clusterPurity(table)
+    for cluster in range(len(centroids)):
+        for option in range(len(labelOptions)):
+            print(seasonNames[labelOptions[option]], table[cluster, option])
+        # On equal amounts the first season in labelOptions wins
+        solution = labelOptions[np.argmax(table[cluster])]
+        print("Cluster {} is season '{}' with a purity of {:.1f}%".format(cluster+1, seasonNames[solution], purity[cluster]*100))
+    print("Total purity of the clustering is {:.1f}% and the inertia is {}\n".format(totalPurity*100, inertia))
+
+    ## PLOTTEN
+    # 10 runs for every k, divided over all cpu's
+    best = elbow(data, range(1, 11), 10)
+    x = list(best)
+    y = [best[k][0] for k in x]
     print("x {} y {}".format(x, y))
-plt.plot(x, y)
-plt.show()
+    plt.plot(x, y)
+    plt.show()
@@ -0,0 +1,234 @@
+import numpy as np
+
+## centroidDistances
+#
+#  Squared distance of every row to every centroid, computed with one matrix product.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the centroids
+def centroidDistances(data, centroids):
+    return (data ** 2).sum(axis=1)[:, None] - 2 * data @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+
+## assignClusters
+#
+#  Assign every row to its nearest centroid. When two centroids are equally near, the first one wins.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the centroids
+#  @return tuple of (cluster index of every row, squared distance of every row to its centroid)
+def assignClusters(data, centroids):
+    distances = centroidDistances(data, centroids)
+    clusters = np.argmin(distances, axis=1)
+    return clusters, np.maximum(distances[np.arange(len(data)), clusters], 0)
+
+## updateCentroids
+#
+#  Mean of the rows of every cluster, computed per feature with bincount. A cluster without rows keeps its centroid.
+#  @param data: matrix with one entry per row
+#  @param clusters: cluster index of every row
+#  @param centroids: the current centroids
+#  @return tuple of (new centroids, amount of rows per cluster)
+def updateCentroids(data, clusters, centroids):
+    counts = np.bincount(clusters, minlength=len(centroids))
+    sums = np.stack([np.bincount(clusters, data[:, j], minlength=len(centroids)) for j in range(data.shape[1])], axis=1)
+    newCentroids = centroids.copy()
+    filled = counts > 0
+    newCentroids[filled] = sums[filled] / counts[filled, None]
+    return newCentroids, counts
+
+## squaredDistancesTo
+#
+#  @param data: matrix with one entry per row
+#  @param point: a single row
+#  @return squared distance of every row of data to point
+def squaredDistancesTo(data, point):
+    difference = data - point
+    return np.einsum('ij,ij->i', difference, difference)
+
+## kMeansPlusPlus
+#
+#  k-means++ seeding: the first centroid is a random row, every next centroid is a row drawn with a probability
+#  proportional to its squared distance to the nearest centroid so far. With more than one candidate this is greedy
+#  k-means++, of the drawn candidates the one that lowers the total squared distance the most is used.
+#  @param data: matrix with one entry per row
+#  @param k: amount of centroids
+#  @param rng: numpy random generator
+#  @param candidates: amount of candidates per centroid, 1 for plain k-means++
+#  @return (k, features) matrix with the starting centroids
+def kMeansPlusPlus(data, k, rng, candidates=1):
+    data = np.asarray(data, dtype=float)
+    centroids = np.empty((k, data.shape[1]))
+    centroids[0] = data[rng.integers(len(data))]
+    closest = squaredDistancesTo(data, centroids[0])
+    for i in range(1, k):
+        total = closest.sum()
+        # When every row is on a centroid already, any row will do
+        probabilities = closest / total if total > 0 else None
+        options = rng.choice(len(data), candidates, p=probabilities)
+        best, bestClosest, bestSum = None, None, np.inf
+        for option in options:
+            optionClosest = np.minimum(closest, squaredDistancesTo(data, data[option]))
+            optionSum = optionClosest.sum()
+            if optionSum < bestSum:
+                best, bestClosest, bestSum = option, optionClosest, optionSum
+        centroids[i] = data[best]
+        closest = bestClosest
+    return centroids
+
+## reseedEmpty
+#
+#  Give every cluster without rows a new centroid, drawn like k-means++ does from the rows that are far from their
+#  own centroid. Rows that are exactly on their centroid are never drawn, so the new cluster gets at least that row.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the centroids, changed in place
+#  @param counts: amount of rows per cluster
+#  @param distances: squared distance of every row to its centroid
+#  @param rng: numpy random generator
+def reseedEmpty(data, centroids, counts, distances, rng):
+    distances = distances.copy()
+    for cluster in np.flatnonzero(counts == 0):
+        total = distances.sum()
+        if total == 0:
+            return
+        row = rng.choice(len(data), p=distances / total)
+        centroids[cluster] = data[row]
+        distances = np.minimum(distances, squaredDistancesTo(data, data[row]))
+
+## lloyd
+#
+#  Lloyd iterations starting from the given centroids. This stops when the assignment of the rows does not change
+#  anymore, when no centroid moved more than tolerance or after maxIterations iterations. When a cluster loses all
+#  its rows only that cluster gets a new centroid, see reseedEmpty.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the starting centroids
+#  @param rng: numpy random generator used for reseeding empty clusters
+#  @param tolerance: largest centroid shift (euclidean distance) that still counts as converged
+#  @param maxIterations: maximum amount of iterations
+#  @return tuple of (centroids, cluster index of every row, inertia), the inertia is the sum of squared distances of
+#  the rows to their centroid and comes from the last assignment step
+def lloyd(data, centroids, rng=None, tolerance=0.0, maxIterations=300):
+    data = np.asarray(data, dtype=float)
+    centroids = np.array(centroids, dtype=float)
+    rng = rng or np.random.default_rng()
+    clusters, distances = assignClusters(data, centroids)
+    for iteration in range(maxIterations):
+        newCentroids, counts = updateCentroids(data, clusters, centroids)
+        if (counts == 0).any():
+            reseedEmpty(data, newCentroids, counts, distances, rng)
+        shift = np.sqrt(((newCentroids - centroids) ** 2).sum(axis=1)).max()
+        centroids = newCentroids
+        newClusters, distances = assignClusters(data, centroids)
+        converged = np.array_equal(newClusters, clusters) or shift <= tolerance
+        clusters = newClusters
+        if converged:
+            break
+    return centroids, clusters, distances.sum()
+
+## hamerly
+#
+#  Hamerly's accelerated version of lloyd, it gives the same clustering from the same starting centroids. Every row
+#  keeps an upper bound on the distance to its own centroid and a lower bound on the distance to any other centroid.
+#  The bounds are moved with the centroid shifts every iteration, and the distances of a row are only computed again
+#  when the bounds (or half the distance from its centroid to the nearest other centroid) can not rule out a change.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the starting centroids
+#  @param rng: numpy random generator used for reseeding empty clusters
+#  @param tolerance: largest centroid shift (euclidean distance) that still counts as converged
+#  @param maxIterations: maximum amount of iterations
+#  @return tuple of (centroids, cluster index of every row, inertia, amount of skipped distance calculations), the
+#  skipped amount is the net saving compared to lloyd: the skipped row to centroid distances minus the k * k centroid
+#  to centroid distances of every iteration and the full pass over all rows that reseeding an empty cluster needs
+def hamerly(data, centroids, rng=None, tolerance=0.0, maxIterations=300):
+    data = np.asarray(data, dtype=float)
+    centroids = np.array(centroids, dtype=float)
+    rng = rng or np.random.default_rng()
+    k = len(centroids)
+    rows = np.arange(len(data))
+    # Bounds are widened by this relative margin, so rounding errors can never cause a wrong skip
+    margin = 1e-9
+
+    # The nearest centroid is chosen on the squared distances, exactly like assignClusters does
+    squared = centroidDistances(data, centroids)
+    clusters = np.argmin(squared, axis=1)
+    distances = np.sqrt(np.maximum(squared, 0))
+    upper = distances[rows, clusters]
+    distances[rows, clusters] = np.inf
+    lower = distances.min(axis=1) if k > 1 else np.full(len(data), np.inf)
+    skipped = 0
+
+    for iteration in range(maxIterations):
+        newCentroids, counts = updateCentroids(data, clusters, centroids)
+        if (counts == 0).any():
+            # The upper bounds are not exact distances, so reseeding needs all distances again
+            reseedEmpty(data, newCentroids, counts, assignClusters(data, centroids)[1], rng)
+            skipped -= len(data) * k
+        shift = np.sqrt(((newCentroids - centroids) ** 2).sum(axis=1))
+        centroids = newCentroids
+        upper = upper + shift[clusters]
+        lower = lower - shift.max()
+
+        # Half the distance from every centroid to its nearest other centroid
+        between = np.sqrt(np.maximum(centroidDistances(centroids, centroids), 0))
+        np.fill_diagonal(between, np.inf)
+        half = between.min(axis=1) / 2
+
+        bound = np.maximum(half[clusters], lower) * (1 - margin)
+        check = np.flatnonzero(upper * (1 + margin) > bound)
+        tightened = len(check)
+        # First only tighten the upper bound, for many rows that is already enough
+        difference = data[check] - centroids[clusters[check]]
+        upper[check] = np.sqrt(np.einsum('ij,ij->i', difference, difference))
+        check = check[upper[check] * (1 + margin) > bound[check]]
+
+        squared = centroidDistances(data[check], centroids)
+        newClusters = clusters.copy()
+        newClusters[check] = np.argmin(squared, axis=1)
+        distances = np.sqrt(np.maximum(squared, 0))
+        upper[check] = distances[np.arange(len(check)), newClusters[check]]
+        distances[np.arange(len(check)), newClusters[check]] = np.inf
+        lower[check] = distances.min(axis=1) if k > 1 else np.inf
+        skipped += len(data) * k - tightened - len(check) * k - k * k
+
+        converged = np.array_equal(newClusters, clusters) or shift.max() <= tolerance
+        clusters = newClusters
+        if converged:
+            break
+
+    # The upper bounds of skipped rows are not exact, so the inertia needs the distance of every row to its centroid
+    difference = data - centroids[clusters]
+    return centroids, clusters, np.einsum('ij,ij->', difference, difference), skipped
+
+## clusterView
+#
+#  The clustering as a dictionary like the old kMeans returned: the key is the centroid as a string, the value the
+#  list of rows in that cluster. Clusters without rows are left out.
+#  @param data: matrix with one entry per row
+#  @param centroids: (k, features) matrix with the centroids
+#  @param clusters: cluster index of every row
+def clusterView(data, centroids, clusters):
+    view = {}
+    for cluster in range(len(centroids)):
+        members = np.asarray(data)[clusters == cluster]
+        if len(members):
+            view[str([float(value) for value in centroids[cluster]])] = list(members)
+    return view
+
+## contingencyTable
+#
+#  Count how often every label occurs in every cluster, in one bincount over (cluster, label) pairs.
+#  @param clusters: cluster index of every row
+#  @param labels: label code of every row
+#  @param k: amount of clusters
+#  @param labelAmount: amount of different label codes
+#  @return (k, labelAmount) matrix with the counts
+def contingencyTable(clusters, labels, k, labelAmount):
+    pairs = np.asarray(clusters) * labelAmount + np.asarray(labels)
+    return np.bincount(pairs, minlength=k * labelAmount).reshape(k, labelAmount)
+
+## clusterPurity
+#
+#  @param table: contingency table made by contingencyTable
+#  @return tuple of (purity of every cluster, purity of the whole clustering), the purity is the fraction of rows
+#  that have the most common label of their cluster, an empty cluster has purity 0
+def clusterPurity(table):
+    sizes = table.sum(axis=1)
+    purity = np.divide(table.max(axis=1), sizes, out=np.zeros(len(table)), where=sizes > 0)
+    return purity, table.max(axis=1).sum() / table.sum()
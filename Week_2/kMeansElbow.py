@@ -0,0 +1,69 @@
+import os, tempfile
+import multiprocessing
+import numpy as np
+from kMeansCore import kMeansPlusPlus, lloyd, hamerly
+
+# Data of a worker process, set once by initWorker
+worker = {}
+
+## initWorker
+#
+#  Runs once in every worker process, the data is memory mapped so all workers share the same pages.
+#  @param dataPath: path to the .npy file with the data
+#  @param accelerated: use hamerly instead of lloyd
+def initWorker(dataPath, accelerated):
+    worker['data'] = np.load(dataPath, mmap_mode='r')
+    worker['accelerated'] = accelerated
+
+## runOnce
+#
+#  A single k-means run, everything random in it comes from its own seed.
+#  @param task: tuple of (k, numpy SeedSequence of this run)
+#  @return tuple of (k, inertia, centroids, amount of skipped distance calculations, 0 without hamerly)
+def runOnce(task):
+    k, seed = task
+    data = np.asarray(worker['data'])
+    rng = np.random.default_rng(seed)
+    centroids = kMeansPlusPlus(data, k, rng)
+    skipped = 0
+    if worker['accelerated']:
+        centroids, clusters, inertia, skipped = hamerly(data, centroids, rng)
+    else:
+        centroids, clusters, inertia = lloyd(data, centroids, rng)
+    return k, float(inertia), centroids, skipped
+
+## elbow
+#
+#  Run k-means a number of times for every k and keep the run with the lowest inertia (sum of squared distances of
+#  the rows to their centroid). The runs are divided over a pool of processes. Every run gets its own seed spawned
+#  from one SeedSequence, so the results are the same whatever the amount of processes. With accelerated the amount
+#  of distance calculations hamerly skipped over all runs is printed per k.
+#  @param data: matrix with one entry per row
+#  @param ks: the k's to try
+#  @param runs: amount of runs per k
+#  @param seed: seed of the SeedSequence
+#  @param processes: amount of worker processes, default is the amount of cpu's
+#  @param accelerated: use hamerly instead of lloyd
+#  @return dictionary of k to (lowest inertia, centroids of that run)
+def elbow(data, ks=range(1, 11), runs=10, seed=0, processes=None, accelerated=False):
+    ks = list(ks)
+    seeds = np.random.SeedSequence(seed).spawn(len(ks) * runs)
+    tasks = [(k, seeds[i * runs + j]) for i, k in enumerate(ks) for j in range(runs)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        dataPath = os.path.join(directory, 'data.npy')
+        np.save(dataPath, np.asarray(data, dtype=float))
+        with multiprocessing.Pool(processes, initWorker, (dataPath, accelerated)) as pool:
+            results = pool.map(runOnce, tasks)
+
+    best = {}
+    skipped = {}
+    # pool.map keeps the order of the tasks, so on equal inertia the first run wins every time
+    for k, inertia, centroids, runSkipped in results:
+        skipped[k] = skipped.get(k, 0) + runSkipped
+        if k not in best or inertia < best[k][0]:
+            best[k] = (inertia, centroids)
+    if accelerated:
+        for k in skipped:
+            print("Hamerly skipped {} distance calculations in {} runs for k={}".format(skipped[k], runs, k))
+    return best
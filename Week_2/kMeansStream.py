@@ -0,0 +1,71 @@
+import itertools
+import numpy as np
+from kMeansCore import assignClusters, kMeansPlusPlus, updateCentroids
+
+## memmapChunks
+#
+#  Go through a (memory mapped) matrix in chunks, only the chunk that is used is read from disk.
+#  @param data: matrix, for example made with np.load(path, mmap_mode='r')
+#  @param chunkSize: amount of rows per chunk
+def memmapChunks(data, chunkSize):
+    for start in range(0, len(data), chunkSize):
+        yield np.asarray(data[start:start + chunkSize], dtype=float)
+
+## csvChunks
+#
+#  Read the features of a weather csv file in chunks, so only one chunk of the file is in memory at a time.
+#  @param path: path to a csv file like dataset1.csv
+#  @param chunkSize: amount of lines per chunk
+def csvChunks(path, chunkSize):
+    with open(path) as file:
+        while True:
+            lines = list(itertools.islice(file, chunkSize))
+            if not lines:
+                return
+            yield np.genfromtxt(lines, delimiter=';', usecols=[1,2,3,4,5,6,7], ndmin=2)
+
+## miniBatchKMeans
+#
+#  Mini-batch k-means that only needs one chunk of the data in memory. Every chunk is assigned to the nearest
+#  centroids, after which each centroid moves towards the mean of its rows in the chunk with a learning rate of
+#  (rows in this chunk) / (rows seen so far), which makes the centroid the running mean of all rows it got.
+#  @param chunks: function without arguments that returns a new iterator over the chunks, called once per pass
+#  @param k: amount of clusters
+#  @param passes: amount of times to go through all chunks
+#  @param rng: numpy random generator used for the k-means++ seeding on the first chunk
+#  @return tuple of (centroids, amount of rows every centroid has seen)
+def miniBatchKMeans(chunks, k, passes=1, rng=None):
+    rng = rng or np.random.default_rng()
+    centroids = None
+    seen = np.zeros(k, dtype=np.int64)
+    for i in range(passes):
+        for chunk in chunks():
+            if centroids is None:
+                centroids = kMeansPlusPlus(chunk, k, rng)
+            clusters = assignClusters(chunk, centroids)[0]
+            means, counts = updateCentroids(chunk, clusters, centroids)
+            seen += counts
+            learnRate = np.divide(counts, seen, out=np.zeros(k), where=seen > 0)
+            centroids += learnRate[:, None] * (means - centroids)
+    return centroids, seen
+
+## assignChunks
+#
+#  Optional final pass that assigns every row to its nearest centroid.
+#  @param chunks: function without arguments that returns a new iterator over the chunks, like for miniBatchKMeans
+#  @param centroids: (k, features) matrix with the centroids
+#  @param out: array to store the cluster indices in, for example a np.memmap, by default a new array is made
+#  @return tuple of (cluster index of every row, sum of squared distances of the rows to their centroids)
+def assignChunks(chunks, centroids, out=None):
+    parts = []
+    inertia = 0.0
+    start = 0
+    for chunk in chunks():
+        clusters, distances = assignClusters(chunk, centroids)
+        inertia += distances.sum()
+        if out is None:
+            parts.append(clusters)
+        else:
+            out[start:start + len(chunk)] = clusters
+        start += len(chunk)
+    return (np.concatenate(parts) if out is None else out), inertia
@@ -0,0 +1,88 @@
+import hashlib, json, os
+import numpy as np
+
+# Name of the directory next to the csv files in which the parsed data is stored
+cacheDirectory = '.weathercache'
+
+# Season names, the season labels are the indices in this array
+seasonNames = np.array(['lente', 'zomer', 'herfst', 'winter'])
+# First month and day (MMDD) of lente, zomer, herfst and winter
+seasonStarts = np.array([301, 601, 901, 1201])
+# Season label of every interval between the season starts, before 0301 and from 1201 it is winter
+seasonOfInterval = np.array([3, 0, 1, 2, 3], dtype=np.int8)
+
+## fileHash
+#
+#  @param path: path of the file to hash
+def fileHash(path):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+## parseWeatherData
+#
+#  Parse the date column and the seven weather features in one pass over the csv file.
+#  @param path: path to a csv file like dataset1.csv, days without a date get date 0
+def parseWeatherData(path):
+    table = np.genfromtxt(path, delimiter=';', usecols=[0,1,2,3,4,5,6,7], ndmin=2)
+    dates = np.nan_to_num(table[:, 0]).astype(np.int64)
+    return dates, np.ascontiguousarray(table[:, 1:])
+
+## seasonLabels
+#
+#  Season label of every date in one vectorized step. Only the month and day are used, so this works for any year
+#  and for datasets spanning multiple years.
+#  @param dates: array with dates formatted as YYYYMMDD
+def seasonLabels(dates):
+    monthDay = np.asarray(dates, dtype=np.int64) % 10000
+    return seasonOfInterval[np.searchsorted(seasonStarts, monthDay, side='right')]
+
+## loadWeatherData
+#
+#  Load the dates and features of a weather csv file. The parsed arrays are cached as .npy files next to the csv,
+#  later calls memory map those instead of parsing the text again. The cache is rebuilt when the csv changed, which
+#  is first checked with the modification time and size and then with a hash of the contents. When the cache can
+#  not be written, the parsed arrays are returned without it.
+#  @param path: path to a csv file like dataset1.csv
+#  @param cache: set to False to always parse the csv
+def loadWeatherData(path, cache=True):
+    if not cache:
+        return parseWeatherData(path)
+
+    directory = os.path.join(os.path.dirname(path), cacheDirectory)
+    name = os.path.join(directory, os.path.basename(path))
+    datesPath, dataPath, metaPath = name + '.dates.npy', name + '.data.npy', name + '.meta.json'
+    status = os.stat(path)
+
+    try:
+        with open(metaPath) as file:
+            meta = json.load(file)
+        valid = meta['mtime'] == status.st_mtime_ns and meta['size'] == status.st_size
+        if not valid and meta['size'] == status.st_size and meta['hash'] == fileHash(path):
+            # Only the modification time changed, remember the new one if the cache can be written to
+            meta['mtime'] = status.st_mtime_ns
+            try:
+                with open(metaPath, 'w') as file:
+                    json.dump(meta, file)
+            except OSError:
+                pass
+            valid = True
+        if valid:
+            return np.load(datesPath, mmap_mode='r'), np.load(dataPath, mmap_mode='r')
+    except (OSError, ValueError, KeyError):
+        pass
+
+    dates, data = parseWeatherData(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        np.save(datesPath, dates)
+        np.save(dataPath, data)
+        # The meta file is written last, so an interrupted write never leaves a cache that looks valid
+        with open(metaPath, 'w') as file:
+            json.dump({'mtime': status.st_mtime_ns, 'size': status.st_size, 'hash': fileHash(path)}, file)
+    except OSError:
+        # For example a read-only dataset directory, the data is parsed already so it is used without a cache
+        pass
+    return dates, data
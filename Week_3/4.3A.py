@@ -1,3 +1,6 @@
+from thresholdCircuit import Circuit, from_perceptrons
+import numpy as np
+
 class Perceptron:
     input = [[]]
     bias = 0
@@ -28,3 +31,20 @@ NAND4 = Perceptron([[NAND2.getActivation(), -0.5], [NAND3.getActivation(), -0.5]
 NAND5 = Perceptron([[NAND1.getActivation(), -0.5], [NAND1.getActivation(), -0.5]], 1)
 print("X1 (+) X2: {}".format(NAND4.getActivation()))
 print("X1 * X2: {}".format(NAND5.getActivation()))
+
+# The same half adder as a circuit, evaluated for the whole truth table at once. NAND1 is computed once and shared.
+adder = Circuit(["X1", "X2"])
+adder.add_gate("NAND1", ["X1", "X2"], [-0.5, -0.5], 1)
+adder.add_gate("NAND2", ["X1", "NAND1"], [-0.5, -0.5], 1)
+adder.add_gate("NAND3", ["NAND1", "X2"], [-0.5, -0.5], 1)
+adder.add_gate("NAND4", ["NAND2", "NAND3"], [-0.5, -0.5], 1)
+adder.add_gate("NAND5", ["NAND1", "NAND1"], [-0.5, -0.5], 1)
+inputs, outputs = adder.truth_table(["NAND4", "NAND5"])
+for entry, output in zip(inputs, outputs):
+    print("X1={} X2={} X1 (+) X2: {} X1 * X2: {}".format(entry[0], entry[1], output[0], output[1]))
+
+# The NAND and NOR Perceptrons as one matrix backed layer, evaluated for all 8 input combinations at once
+layer = from_perceptrons([NOR, Perceptron([ADDERinput1, ADDERinput2, [0, 0]], 1)])
+combinations = np.array([[x1, x2, x3] for x1 in [0, 1] for x2 in [0, 1] for x3 in [0, 1]])
+for entry, output in zip(combinations, layer.get_activation(combinations)):
+    print("Input: {} NOR: {} NAND(X1, X2): {}".format(entry, output[0], output[1]))
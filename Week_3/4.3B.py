@@ -1,11 +1,7 @@
 import random
-import math
-
-def sigmoid(x):
-    return 1 / (1 + math.exp(-x))
-
-def derivativeSigmoid(x):
-    return sigmoid(x) * (1-sigmoid(x))
+import time
+import numpy as np
+from activation import sigmoid, derivative_sigmoid
 
 class Perceptron:
     weights = []
@@ -30,14 +26,50 @@ class Perceptron:
 
     def update(self, expected):
         differences = []
+        # The activation is the same for every input, so it and its derivative are computed once
+        activation = self.get_activation()
+        gradient = derivative_sigmoid(activation) * (expected - activation)
 
         for entry in self.input:
-            tmp = self.learnRate * entry * derivativeSigmoid(self.get_sum()) * (expected - self.get_activation())
+            tmp = self.learnRate * entry * gradient
             differences.append(tmp)
 
         for i in range(len(differences)):
             self.weights[i] = self.weights[i] + differences[i]
 
+    def train(self, inputs, expected, maxEpochs=100000, targetError=0.001, tolerance=1e-7, batchSize=None):
+        """
+        Train with the delta rule on a whole truth table per epoch. The weights are a numpy vector during training,
+        so every (mini-)batch is one forward pass and one weight update for all inputs at once.
+        :param inputs: list of input lists, without the bias
+        :param expected: list with the expected output of every input list
+        :param maxEpochs: maximum amount of epochs
+        :param targetError: training stops when the mean squared error on all inputs is below this
+        :param tolerance: training also stops when no weight changed more than this during an epoch
+        :param batchSize: amount of inputs per weight update, standard is the whole truth table
+        :return: tuple of (amount of epochs, wall time in seconds)
+        """
+        start = time.perf_counter()
+        inputs = np.array([list(entry) + [self.bias] for entry in inputs], dtype=float)
+        expected = np.array(expected, dtype=float)
+        batchSize = batchSize or len(inputs)
+        weights = np.array(self.weights, dtype=float)
+
+        for epoch in range(1, maxEpochs + 1):
+            previous = weights.copy()
+            for begin in range(0, len(inputs), batchSize):
+                batch = inputs[begin:begin + batchSize]
+                activation = sigmoid(batch @ weights)
+                # The derivative of the sigmoid follows from the activation, no second forward pass needed
+                gradient = derivative_sigmoid(activation) * (expected[begin:begin + batchSize] - activation)
+                weights += self.learnRate * (batch.T @ gradient)
+            error = np.mean((expected - sigmoid(inputs @ weights)) ** 2)
+            if error < targetError or np.abs(weights - previous).max() < tolerance:
+                break
+
+        self.weights = weights.tolist()
+        return epoch, time.perf_counter() - start
+
     def set_input(self, input):
         # Minus one because of the bias
         if len(input) != len(self.input)-1:
@@ -72,10 +104,8 @@ trainingNOR = [[[0,0,0], 1],
                [[1,0,1], 0]]
 
 NOR = Perceptron(trainingNOR[0][0])
-for j in range(100):
-    for i in range(len(trainingNOR)):
-        NOR.set_input(trainingNOR[i][0])
-        NOR.update(trainingNOR[i][1])
+epochs, seconds = NOR.train([entry[0] for entry in trainingNOR], [entry[1] for entry in trainingNOR])
+print("Training took {} epochs and {:.3f} seconds".format(epochs, seconds))
 
 print("NOR RESULTS:")
 for i in range(len(trainingNOR)):
@@ -1,14 +1,7 @@
 import random
-import math
 import numpy as np
-
-
-def sigmoid(x):
-    return 1 / (1 + (math.e ** (-x)))
-
-
-def derivativeSigmoid(x):
-    return sigmoid(x) * (1 - sigmoid(x))
+from activation import sigmoid, derivative_sigmoid
+from compiledNetwork import CompiledNetwork
 
 
 class Perceptron:
@@ -33,14 +26,17 @@ class Perceptron:
         self.sum = 0
         self.activation = 0
 
-    def get_sum(self):
+    def get_sum(self, cached=False):
         """
+        :param cached: use the stored activation of the input Perceptrons instead of calculating it again, only
+        correct when they are already calculated for the current input (see Network.calc_output)
         :return returns the weighted sum
         """
         self.sum = 0
         for i in range(len(self.input)):
             if type(self.input[i]) is Perceptron:
-                self.sum += (self.input[i].get_activation() * self.weights[i])
+                activation = self.input[i].activation if cached else self.input[i].get_activation()
+                self.sum += (activation * self.weights[i])
             else:
                 self.sum += self.input[i] * self.weights[i]
         return self.sum
@@ -59,9 +55,9 @@ class Perceptron:
         :return: the calculated error
         """
         if error != None and expectation == None:
-            self.error = derivativeSigmoid(self.sum) * error
+            self.error = derivative_sigmoid(self.activation) * error
         elif expectation != None and error == None:
-            self.error = derivativeSigmoid(self.sum) * (expectation - self.activation)
+            self.error = derivative_sigmoid(self.activation) * (expectation - self.activation)
         else:
             print("Wrong function call on calc_error")
             print("Input you have given was error={} expectation={}".format(error, expectation))
@@ -114,11 +110,12 @@ class Perceptron:
             # re-add the bias
             self.input = input + [self.bias]
 
-    def get_activation(self):
+    def get_activation(self, cached=False):
         """
+        :param cached: use the stored activation of the input Perceptrons, see get_sum
         :return: The calculated activation value
         """
-        self.activation = sigmoid(self.get_sum())
+        self.activation = sigmoid(self.get_sum(cached))
         return self.activation
 
 
@@ -134,6 +131,7 @@ class Network:
         :param network: list of lists containing Perceptrons
         """
         self.network = list(reversed(network))  # Reverse so index 0 is output layer
+        self.order = self.topological_order()
         self.outputError = []
 
     def update(self, numbers):
@@ -170,6 +168,28 @@ class Network:
                 for entry in self.network[i - 1]:
                     entry.calc_nested_error(error)
 
+    def topological_order(self):
+        """
+        Order all Perceptrons of the network so every Perceptron comes after the Perceptrons it has as input
+        :return: list of Perceptrons, starting with the first layer
+        """
+        order = []
+        visited = set()
+
+        def visit(perceptron):
+            if perceptron in visited:
+                return
+            visited.add(perceptron)
+            for entry in perceptron.input:
+                if type(entry) is Perceptron:
+                    visit(entry)
+            order.append(perceptron)
+
+        for layer in reversed(self.network):
+            for perceptron in layer:
+                visit(perceptron)
+        return order
+
     def get_output(self):
         """
         :return: the calculated output of the nework
@@ -181,18 +201,11 @@ class Network:
         """
         Calculate the output of the network. This is stored in a list variable.
         """
-        reversedNetwork = list(reversed(self.network))  # Reverse so index 0 is first layer
-        self.output = []
-        # The get activation looks to own layer and layer before, so skip first layer and stop at last layer
-        for layer in reversedNetwork:
-            if layer == reversedNetwork[0]:
-                continue
-            elif layer == reversedNetwork[-1]:
-                for entry in layer:
-                    self.output.append(entry.get_activation())
-            else:
-                for entry in layer:
-                    entry.get_activation()
+        # Every Perceptron comes after its inputs, so each activation is calculated once and read from the stored
+        # value by the Perceptrons that use it
+        for perceptron in self.order:
+            perceptron.get_activation(cached=True)
+        self.output = [entry.activation for entry in self.network[0]]
 
     def __str__(self):
         """
@@ -253,13 +266,15 @@ outputlayer = [output_1, output_2, output_3]
 
 network = Network([layer1, layer2, outputlayer])
 
-trainingAmount = 100
-for j in range(trainingAmount):
-    for i in range(len(data)):
-        for perceptron in layer1:
-            perceptron.set_input(data[i])
-        network.update(types[i])
-    print("Progress: {:5}%".format(round((j/trainingAmount)*100, 2)))
+# Train on the weight matrices of the network with shuffled mini-batches, every batch is one weight update with the
+# mean change of its entries. With 10 entries per batch, 1000 epochs give as many updates as 100 epochs of one
+# network.update per entry of data.
+compiled = CompiledNetwork(network)
+trainingAmount = 1000
+batchSize = 10
+speed = compiled.train_batches(data, types, trainingAmount, batchSize)
+compiled.write_back()
+print("Trained {} epochs at {:.0f} entries per second".format(trainingAmount, speed))
 
 hits = 0
 for i in range(len(testData)):
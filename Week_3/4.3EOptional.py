@@ -1,11 +1,5 @@
 import random
-import math
-
-def sigmoid(x):
-    return 1 / (1 + (math.e ** (-x)))
-
-def derivativeSigmoid(x):
-    return sigmoid(x) * (1-sigmoid(x))
+from activation import sigmoid, derivative_sigmoid
 
 class Perceptron:
     """
@@ -30,14 +24,17 @@ class Perceptron:
         self.sum = 0
         self.activation = 0
 
-    def get_sum(self):
+    def get_sum(self, cached=False):
         """
+        :param cached: use the stored activation of the input Perceptrons instead of calculating it again, only
+        correct when they are already calculated for the current input (see Network.calc_output)
         :return returns the weighted sum
         """
         self.sum = 0
         for i in range(len(self.input)):
             if type(self.input[i]) is Perceptron:
-                self.sum += (self.input[i].get_activation() * self.weights[i])
+                activation = self.input[i].activation if cached else self.input[i].get_activation()
+                self.sum += (activation * self.weights[i])
             else:
                 self.sum += self.input[i] * self.weights[i]
         return self.sum
@@ -57,9 +54,9 @@ class Perceptron:
         :return: the calculated error
         """
         if error != None and weight != None and expectation == None:
-            self.error = derivativeSigmoid(self.sum) * weight * error
+            self.error = derivative_sigmoid(self.activation) * weight * error
         elif expectation != None and weight== None and error == None:
-            self.error = derivativeSigmoid(self.sum) * (expectation - self.activation)
+            self.error = derivative_sigmoid(self.activation) * (expectation - self.activation)
         else:
             print("Wrong function call on calc_error")
             print("Input you have given was error={} weight={} expectation={}".format(error, weight, expectation))
@@ -101,11 +98,12 @@ class Perceptron:
             # re-add the bias
             self.input = input + [self.bias]
 
-    def get_activation(self):
+    def get_activation(self, cached=False):
         """
+        :param cached: use the stored activation of the input Perceptrons, see get_sum
         :return: The calculated activation value
         """
-        self.activation = sigmoid(self.get_sum())
+        self.activation = sigmoid(self.get_sum(cached))
         return self.activation
 
 class Network:
@@ -119,6 +117,7 @@ class Network:
         :param network: list of lists containing Perceptrons
         """
         self.network = list(reversed(network))  # Reverse so index 0 is output layer
+        self.order = self.topological_order()
         self.outputError = []
 
     def update(self, numbers):
@@ -161,6 +160,28 @@ class Network:
 
 
 
+    def topological_order(self):
+        """
+        Order all Perceptrons of the network so every Perceptron comes after the Perceptrons it has as input
+        :return: list of Perceptrons, starting with the first layer
+        """
+        order = []
+        visited = set()
+
+        def visit(perceptron):
+            if perceptron in visited:
+                return
+            visited.add(perceptron)
+            for entry in perceptron.input:
+                if type(entry) is Perceptron:
+                    visit(entry)
+            order.append(perceptron)
+
+        for layer in reversed(self.network):
+            for perceptron in layer:
+                visit(perceptron)
+        return order
+
     def get_output(self):
         """
         :return: the calculated output of the nework
@@ -172,16 +193,9 @@ class Network:
         """
         Calculate the output of the network. This is stored in a list variable.
         """
-        reversedNetwork = list(reversed(self.network))  # Reverse so index 0 is first layer
-        self.output = []
-        # The get activation looks to own layer and layer before, so skip first layer and stop at last layer
-        for layer in reversedNetwork:
-            if layer == reversedNetwork[0]:
-                continue
-            elif layer == reversedNetwork[-1]:
-                for entry in layer:
-                    self.output.append(entry.get_activation())
-            else:
-                for entry in layer:
-                    entry.get_activation()
+        # Every Perceptron comes after its inputs, so each activation is calculated once and read from the stored
+        # value by the Perceptrons that use it
+        for perceptron in self.order:
+            perceptron.get_activation(cached=True)
+        self.output = [entry.activation for entry in self.network[0]]
 
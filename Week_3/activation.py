@@ -0,0 +1,134 @@
+import math
+import numpy as np
+
+
+def sigmoid(x, out=None):
+    """
+    Numerically stable sigmoid, works on single numbers and on numpy arrays. exp is only taken of -|x|, so it never
+    overflows, also not for large negative x.
+    :param x: number or array
+    :param out: optional array to write the result to, must have the shape of x
+    :return: the sigmoid of x
+    """
+    if out is None and isinstance(x, (int, float)):
+        # Plain math is a lot faster than numpy for a single number
+        if x >= 0:
+            return 1 / (1 + math.exp(-x))
+        z = math.exp(x)
+        return z / (1 + z)
+
+    x = np.asarray(x, dtype=float)
+    if out is None:
+        out = np.empty_like(x)
+    # The sign is needed at the end, take it before out is written because out may be x itself
+    positive = x >= 0
+    # sigmoid(-|x|) = z / (1 + z) with z = exp(-|x|), for positive x the sigmoid is 1 - sigmoid(-|x|)
+    np.abs(x, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    np.divide(out, 1 + out, out=out)
+    np.subtract(1, out, out=out, where=positive)
+    return out
+
+
+def derivative_sigmoid(activation, out=None):
+    """Derivative of the sigmoid, expects the already calculated (cached) activation instead of the sum"""
+    if out is None:
+        return activation * (1 - activation)
+    # 1 - a goes to a temporary array first, so out may be the activation itself
+    return np.multiply(activation, 1 - activation, out=out)
+
+
+def tanh(x, out=None):
+    """Tanh, works on single numbers and on numpy arrays"""
+    if out is None and isinstance(x, (int, float)):
+        return math.tanh(x)
+    return np.tanh(x, out=out)
+
+
+def derivative_tanh(activation, out=None):
+    """Derivative of tanh, expects the already calculated (cached) activation instead of the sum"""
+    if out is None:
+        return 1 - activation * activation
+    np.multiply(activation, activation, out=out)
+    return np.subtract(1, out, out=out)
+
+
+def relu(x, out=None):
+    """ReLU, works on single numbers and on numpy arrays"""
+    if out is None and isinstance(x, (int, float)):
+        return max(float(x), 0.0)
+    return np.maximum(x, 0, out=out)
+
+
+def derivative_relu(activation, out=None):
+    """Derivative of ReLU, expects the already calculated (cached) activation instead of the sum"""
+    if out is None and isinstance(activation, (int, float)):
+        return 1.0 if activation > 0 else 0.0
+    if out is None:
+        return (np.asarray(activation) > 0).astype(float)
+    return np.greater(activation, 0, out=out, casting='unsafe')
+
+
+def softmax(x, axis=-1, out=None):
+    """
+    Numerically stable softmax, the largest value is subtracted before taking exp so it never overflows
+    :param x: array with the values, for a matrix every row (axis=-1) is one softmax
+    :param axis: axis along which the values sum to 1
+    :param out: optional array to write the result to, must have the shape of x
+    :return: the softmax of x
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.subtract(x, x.max(axis=axis, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=axis, keepdims=True)
+    return out
+
+
+class LookupTable:
+    """
+    Fast approximation of an activation function by a precomputed table. The input is clamped to [-limit, limit]
+    and rounded to the nearest table entry, which is accurate enough for training with many inputs.
+    """
+
+    def __init__(self, function=sigmoid, limit=8.0, size=4096):
+        """
+        :param function: the activation function to approximate, for example sigmoid or tanh
+        :param limit: inputs outside [-limit, limit] are clamped
+        :param size: amount of entries in the table
+        """
+        self.limit = limit
+        self.scale = (size - 1) / (2 * limit)
+        self.table = function(np.linspace(-limit, limit, size))
+
+    def __call__(self, x, out=None):
+        """
+        :param x: number or array
+        :param out: optional array to write the result to, must have the shape of x
+        :return: the approximated activation of x
+        """
+        index = np.rint((np.clip(x, -self.limit, self.limit) + self.limit) * self.scale).astype(np.intp)
+        return np.take(self.table, index, out=out)
+
+
+if __name__ == '__main__':
+    # Check that every function gives the same result with a new array, a separate out buffer and in place
+    values = np.array([-800.0, -3.0, -0.5, 0.0, 0.5, 3.0, 800.0])
+    checks = [(sigmoid, values), (tanh, values), (relu, values), (softmax, values),
+              (derivative_sigmoid, sigmoid(values)), (derivative_tanh, tanh(values)), (derivative_relu, relu(values)),
+              (LookupTable(), values)]
+    for function, argument in checks:
+        expected = function(argument.copy())
+        separate = function(argument.copy(), out=np.empty_like(argument))
+        inPlace = argument.copy()
+        function(inPlace, out=inPlace)
+        name = getattr(function, '__name__', type(function).__name__)
+        if not (np.array_equal(expected, separate) and np.array_equal(expected, inPlace)):
+            print("ERROR: {} gives a different result with out=".format(name))
+            exit()
+        print("{:20} ok".format(name))
+    scalars = [float(sigmoid(x)) for x in values]
+    if not np.allclose(scalars, sigmoid(values), rtol=1e-15, atol=0):
+        print("ERROR: sigmoid of single numbers differs from sigmoid of an array")
+        exit()
+    print("{:20} ok".format("single numbers"))
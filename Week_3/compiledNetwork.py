@@ -0,0 +1,123 @@
+import time
+import numpy as np
+from activation import sigmoid, derivative_sigmoid
+
+
+class CompiledNetwork:
+    """
+    A Network of sigmoid Perceptrons (see 4.3D) stored as one weight matrix and one bias vector per layer, so a layer
+    is evaluated and trained with matrix products instead of a Python loop over Perceptrons and their inputs. The
+    Perceptrons are not changed until write_back is called.
+    """
+
+    def __init__(self, network):
+        """
+        :param network: Network with fully connected layers, the first layer has numbers as input and every other
+        layer has the Perceptrons of the layer before it, in the same order, as input
+        """
+        # Network stores the output layer first
+        self.layers = list(reversed(network.network))
+        self.weights = []
+        self.bias = []
+        self.learnRates = []
+        for index, layer in enumerate(self.layers):
+            for perceptron in layer:
+                inputs = perceptron.input[:-1]
+                if index == 0:
+                    connected = not any(hasattr(entry, 'activation') for entry in inputs)
+                    connected = connected and len(inputs) == len(layer[0].input) - 1
+                else:
+                    connected = len(inputs) == len(self.layers[index - 1])
+                    connected = connected and all(a is b for a, b in zip(inputs, self.layers[index - 1]))
+                if not connected:
+                    print("ERROR: Layer {} is not fully connected to the layer before it".format(index + 1))
+                    exit()
+            # The bias input of a Perceptron is -1 and its weight is the last one, so the bias is minus that weight
+            weights = np.array([perceptron.weights for perceptron in layer], dtype=float)
+            self.weights.append(np.ascontiguousarray(weights[:, :-1]))
+            self.bias.append(-weights[:, -1])
+            self.learnRates.append(np.array([perceptron.learnRate for perceptron in layer], dtype=float))
+
+    def forward(self, inputs):
+        """
+        :param inputs: (batch, inputs) matrix, or a single input vector
+        :return: list with the activations of every layer, the last one is the output of the network
+        """
+        activations = []
+        activation = np.asarray(inputs, dtype=float)
+        for weights, bias in zip(self.weights, self.bias):
+            activation = sigmoid(activation @ weights.T + bias)
+            activations.append(activation)
+        return activations
+
+    def get_output(self, inputs):
+        """
+        :param inputs: (batch, inputs) matrix, or a single input vector
+        :return: (batch, outputs) matrix with the output of the network, or a vector for a single input vector
+        """
+        return self.forward(inputs)[-1]
+
+    def backprop(self, inputs, expected, scale=1.0):
+        """
+        One weight update with backpropagation, the changes of all inputs in the batch are added together. Like
+        Network.update, all errors are calculated with the weights from before the update.
+        :param inputs: (batch, inputs) matrix
+        :param expected: (batch, outputs) matrix with the expected outputs
+        :param scale: factor for the change, 1 / batch size uses the mean change instead of the sum
+        """
+        activations = self.forward(inputs)
+        error = derivative_sigmoid(activations[-1]) * (expected - activations[-1])
+        for index in reversed(range(len(self.weights))):
+            previous = activations[index - 1] if index > 0 else inputs
+            learnRates = self.learnRates[index] * scale
+            change = learnRates[:, None] * (error.T @ previous)
+            biasChange = learnRates * error.sum(axis=0)
+            if index > 0:
+                error = derivative_sigmoid(previous) * (error @ self.weights[index])
+            self.weights[index] += change
+            self.bias[index] += biasChange
+
+    def train(self, inputs, expected, epochs=1):
+        """
+        Train in the same way as Network.update: one weight update per input, in the given order
+        :param inputs: (amount, inputs) matrix, for example the data of 4.3D
+        :param expected: (amount, outputs) matrix with the expected outputs
+        :param epochs: amount of times to go through all inputs
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        expected = np.asarray(expected, dtype=float)
+        for epoch in range(epochs):
+            for i in range(len(inputs)):
+                self.backprop(inputs[i:i + 1], expected[i:i + 1])
+
+    def train_batches(self, inputs, expected, epochs=1, batchSize=16, rng=None):
+        """
+        Train with mini-batches, every epoch goes through the inputs in a new random order. Every batch is one
+        weight update with the mean change of its inputs.
+        :param inputs: (amount, inputs) matrix with all inputs
+        :param expected: (amount, outputs) matrix with the expected outputs, for example one-hot encoded classes
+        :param epochs: amount of times to go through all inputs
+        :param batchSize: amount of inputs per weight update
+        :param rng: numpy random generator used for the order of the inputs
+        :return: amount of inputs trained on per second
+        """
+        rng = rng or np.random.default_rng()
+        inputs = np.asarray(inputs, dtype=float)
+        expected = np.asarray(expected, dtype=float)
+        start = time.perf_counter()
+        for epoch in range(epochs):
+            # Reorder once per epoch, after that every batch is a slice instead of a gather of random rows
+            order = rng.permutation(len(inputs))
+            shuffledInputs, shuffledExpected = inputs[order], expected[order]
+            for begin in range(0, len(inputs), batchSize):
+                batch = shuffledInputs[begin:begin + batchSize]
+                self.backprop(batch, shuffledExpected[begin:begin + batchSize], 1 / len(batch))
+        return epochs * len(inputs) / (time.perf_counter() - start)
+
+    def write_back(self):
+        """
+        Store the weights in the Perceptrons again, so the Network and Perceptrons give the trained results
+        """
+        for layer, weights, bias in zip(self.layers, self.weights, self.bias):
+            for perceptron, row, value in zip(layer, weights.tolist(), (-bias).tolist()):
+                perceptron.weights[:] = row + [value]
@@ -0,0 +1,135 @@
+import itertools
+import numpy as np
+
+
+class ThresholdLayer:
+    """
+    Many threshold units with the same inputs, stored as one weight matrix and one bias vector. A unit outputs 1 if
+    its weighted sum + bias is higher than 0, otherwise 0, just like the Perceptron of 4.3A.
+    """
+
+    def __init__(self, weights, bias):
+        """
+        :param weights: (units, inputs) matrix with a row of weights per unit
+        :param bias: vector with the bias of every unit
+        """
+        self.weights = np.array(weights, dtype=float, ndmin=2)
+        self.bias = np.array(bias, dtype=float, ndmin=1)
+        # Stored transposed, so a batch is evaluated with one product of (batch, inputs) x (inputs, units)
+        self.weightsT = np.ascontiguousarray(self.weights.T)
+
+    def get_activation(self, inputs):
+        """
+        :param inputs: (batch, inputs) matrix, or a single input vector
+        :return: (batch, units) matrix of 0's and 1's, or a vector for a single input vector
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        return (inputs @ self.weightsT + self.bias > 0).astype(np.int8)
+
+
+def from_perceptrons(perceptrons):
+    """
+    Convert step Perceptrons (see 4.3A) that all have the same amount of inputs to a ThresholdLayer. Only the weights
+    and biases are used, the input values stored in the Perceptrons are ignored.
+    :param perceptrons: list of Perceptrons, their input is a list of [value, weight] pairs
+    :return: ThresholdLayer with a unit per Perceptron, in the same order
+    """
+    if len({len(perceptron.input) for perceptron in perceptrons}) != 1:
+        print("ERROR: All Perceptrons need the same amount of inputs to be in one layer")
+        exit()
+    weights = [[weight for value, weight in perceptron.input] for perceptron in perceptrons]
+    return ThresholdLayer(weights, [perceptron.bias for perceptron in perceptrons])
+
+
+class Circuit:
+    """
+    Circuit of threshold units (like the step Perceptron of 4.3A) that is evaluated for a whole batch of inputs at
+    once. The gates are ordered once, after that every layer of gates is a single weighted sum and threshold over
+    the batch. Every gate output is stored, so a gate that is used by several other gates is only computed once.
+    """
+
+    def __init__(self, inputs, blockSize=16384):
+        """
+        :param inputs: list of names of the inputs of the circuit
+        :param blockSize: amount of input vectors that are evaluated together
+        """
+        self.inputs = list(inputs)
+        self.blockSize = blockSize
+        self.gates = {}
+        self.layers = None
+
+    def add_gate(self, name, sources, weights, bias):
+        """
+        Add a threshold unit, its output is 1 if the weighted sum of its sources + bias is higher than 0, otherwise 0
+        :param name: name of the gate, can be used as source by other gates
+        :param sources: list of names of inputs or gates
+        :param weights: list with a weight per source
+        :param bias: bias of the gate
+        """
+        if name in self.gates or name in self.inputs or len(sources) != len(weights):
+            print("ERROR: Gate {} already exists or has not one weight per source".format(name))
+            exit()
+        self.gates[name] = (list(sources), list(weights), bias)
+        self.layers = None
+
+    def compile(self):
+        """
+        Order the gates topologically and group them in layers, a gate is in the layer after the last of its sources.
+        Every layer is stored as the columns it reads and a ThresholdLayer.
+        """
+        depth = {name: 0 for name in self.inputs}
+        remaining = dict(self.gates)
+        while remaining:
+            ready = [name for name, gate in remaining.items() if all(source in depth for source in gate[0])]
+            if not ready:
+                print("ERROR: The circuit contains a loop or an unknown source: {}".format(list(remaining)))
+                exit()
+            for name in ready:
+                depth[name] = 1 + max(depth[source] for source in remaining.pop(name)[0])
+
+        # Column of every signal in the buffer that holds the inputs followed by all gate outputs
+        self.order = self.inputs + sorted(self.gates, key=lambda name: depth[name])
+        self.column = {name: i for i, name in enumerate(self.order)}
+        self.layers = []
+        for level in range(1, max(depth.values()) + 1):
+            names = [name for name in self.order if depth[name] == level and name in self.gates]
+            sources = sorted({self.column[source] for name in names for source in self.gates[name][0]})
+            position = {column: i for i, column in enumerate(sources)}
+            weights = np.zeros((len(names), len(sources)))
+            for j, name in enumerate(names):
+                for source, weight in zip(*self.gates[name][:2]):
+                    weights[j, position[self.column[source]]] += weight
+            layer = ThresholdLayer(weights, [self.gates[name][2] for name in names])
+            self.layers.append((np.array(sources), layer, self.column[names[0]]))
+
+    def evaluate(self, inputs, outputs=None):
+        """
+        Evaluate the circuit for a batch of input vectors
+        :param inputs: (batch, amount of inputs) matrix of 0's and 1's
+        :param outputs: list of names of the signals to return, standard is all gates
+        :return: (batch, amount of outputs) matrix with the values of the requested signals
+        """
+        if self.layers is None:
+            self.compile()
+        inputs = np.atleast_2d(inputs)
+        outputs = outputs if outputs is not None else list(self.gates)
+        columns = [self.column[name] for name in outputs]
+        result = np.empty((len(inputs), len(columns)), dtype=np.int8)
+        # The batch is evaluated in blocks, so the buffer with all signals of a block stays small
+        for begin in range(0, len(inputs), self.blockSize):
+            block = inputs[begin:begin + self.blockSize]
+            signals = np.empty((len(block), len(self.order)), dtype=float)
+            signals[:, :len(self.inputs)] = block
+            for sources, layer, start in self.layers:
+                # Gates of a layer have consecutive columns in the buffer
+                signals[:, start:start + len(layer.bias)] = layer.get_activation(signals[:, sources])
+            result[begin:begin + len(block)] = signals[:, columns]
+        return result
+
+    def truth_table(self, outputs=None):
+        """
+        :param outputs: list of names of the signals to return, standard is all gates
+        :return: tuple of (all input combinations, the requested outputs for each of them)
+        """
+        inputs = np.array(list(itertools.product([0, 1], repeat=len(self.inputs))), dtype=np.int8)
+        return inputs, self.evaluate(inputs, outputs)
@@ -1,7 +1,4 @@
-import math, random, numpy as np
-
-def sigmoid(x):
-    return 1 / (1 + math.e ** (-x))
+import random, numpy as np
 
 data = [[[0,0], 1],
         [[0,1], 0],
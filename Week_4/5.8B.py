@@ -1,8 +1,5 @@
-import math, random, numpy as np
-
-
-def sigmoid(x):
-    return 1 / (1 + math.e ** (-x))
+import random, numpy as np
+from activation import sigmoid
 
 
 def predict(x, theta):
@@ -1,21 +1,5 @@
 import numpy as np
-from math import e
-
-def sigmoid(x):
-    """Standard sigmoid; since it relies on ** to do computation, it broadcasts on vectors and matrices"""
-    return 1 / (1 - (np.power(e, -x)))
-
-def derivative_sigmoid(x):
-    """Expects input x to be already sigmoid-ed"""
-    return x * (1 - x)
-
-def tanh(x):
-    """Standard tanh; since it relies on ** and * to do computation, it broadcasts on vectors and matrices"""
-    return (1 - e ** (-2*x))/ (1 + e ** (-2*x))
-
-def derived_tanh(x):
-    """Expects input x to already be tanh-ed."""
-    return 1 - tanh(x)
+from activation import sigmoid, derivative_sigmoid
 
 
 def forward(inputs,weights,function=sigmoid,step=-1):
@@ -96,4 +80,4 @@ for i in range(100):
             w[index] = w[index] + deltas[index]
 print()
 for entry in range(len(inputs)):
-    print("Expected: {}, Got: {}".format(output[entry], forward(inputs[entry], w)-1))
+    print("Expected: {}, Got: {}".format(output[entry], forward(inputs[entry], w)))
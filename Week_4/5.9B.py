@@ -1,5 +1,5 @@
 import os, gzip, pickle, numpy as np
-from math import e
+from activation import sigmoid, derivative_sigmoid
 from urllib import request
 
 url = "http://deeplearning.net/data/mnist/mnist.pkl.gz"
@@ -25,23 +25,6 @@ convertTable= {1: np.array([1, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
                9: np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 0]),
                0: np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 1])}
 
-def sigmoid(x):
-    """Standard sigmoid; since it relies on ** to do computation, it broadcasts on vectors and matrices"""
-    return 1 / (1 - (e**(-x)))
-
-def derivative_sigmoid(x):
-    """Expects input x to be already sigmoid-ed"""
-    return x * (1 - x)
-
-def tanh(x):
-    """Standard tanh; since it relies on ** and * to do computation, it broadcasts on vectors and matrices"""
-    return (1 - e ** (-2*x))/ (1 + e ** (-2*x))
-
-def derived_tanh(x):
-    """Expects input x to already be tanh-ed."""
-    return 1 - tanh(x)
-
-
 def forward(inputs,weights,function=sigmoid,step=-1):
     """Function needed to calculate activation on a particular layer.
     step=-1 calculates all layers, thus provides the output of the network